@@ -5,38 +5,25 @@ Process WordPress Uncategorized posts and convert to TLH Markdown site HTML file
 import json
 import re
 import os
+import sys
 import requests
 from html import unescape
 from datetime import datetime
 
-# Brand color
-BRAND_COLOR = "#38b5ad"
+# Shared build helpers live in scripts/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
 
-# Category mapping keywords
-CATEGORY_KEYWORDS = {
-    "Real Estate": ["realtor", "home buying", "selling home", "real estate", "property", "cash offer", "home sale"],
-    "Renovation": ["renovation", "repair", "remodel", "update", "fix", "contractor", "construction"],
-    "Senior Moving": ["senior", "assisted living", "downsizing", "elder", "aging", "retirement", "care placement"],
-    "Antique Collectibles": ["antique", "collectible", "vintage", "mid-century", "modern furniture", "barbie", "kitchenware", "pottery", "fine art", "rare"],
-    "News": ["announcement", "news", "update", "company"],
-    "Estate Sales": ["estate sale", "sale at", "pricing", "selling items", "treasure", "shopper"]  # default fallback
-}
+from categories import categorize_post
+from image_hints import (
+    MissingImageError, hero_image_html, lazy_load_images, preload_link, save_cache,
+)
 
-def categorize_post(title, content):
-    """Determine category based on title and content"""
-    text = (title + " " + content).lower()
-    
-    # Strip HTML tags from content for analysis
-    text = re.sub(r'<[^>]+>', ' ', text)
-    
-    # Check each category
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in text:
-                return category
-    
-    # Default to Estate Sales
-    return "Estate Sales"
+# Generated pages and their images live under blog/
+BLOG_DIR = "blog"
+UNCATEGORIZED_MANIFEST = f"{BLOG_DIR}/uncategorized-manifest.json"
+
+# Brand color
+BRAND_COLOR = "#38b5ad"
 
 def clean_html_content(html):
     """Clean WordPress HTML content"""
@@ -98,7 +85,7 @@ def create_html_file(post, category, image_filename):
     content = post['content']['rendered']
     
     # Clean content
-    clean_content = clean_html_content(content)
+    clean_content = lazy_load_images(clean_html_content(content), BLOG_DIR)
     
     # If content is mostly just images/galleries, create a simple description
     text_content = extract_text_content(content)
@@ -111,8 +98,11 @@ def create_html_file(post, category, image_filename):
     
     # Image path
     image_html = ""
+    preload_html = ""
     if image_filename:
-        image_html = f'<img src="images/{image_filename}" alt="{title}" class="featured-image">'
+        image_src = f"images/{image_filename}"
+        image_html = hero_image_html(image_src, title, "featured-image", BLOG_DIR)
+        preload_html = preload_link(image_src)
     
     html = f'''<!DOCTYPE html>
 <html lang="en">
@@ -123,6 +113,9 @@ def create_html_file(post, category, image_filename):
   <meta name="description" content="{text_content[:160]}">
   <link rel="canonical" href="https://iambarabbas.github.io/tlh-markdown-demo/blog/{slug}.html">
   <link rel="icon" href="../images/favicon.png">
+  <link rel="alternate" type="application/feed+json" title="True Legacy Homes Blog" href="/blog/feed.json">
+  <link rel="alternate" type="application/rss+xml" title="True Legacy Homes Blog" href="/blog/feed.xml">
+  {preload_html}
   <style>
     * {{ margin: 0; padding: 0; box-sizing: border-box; }}
     body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; }}
@@ -217,15 +210,20 @@ def main():
                 if ext not in ['jpg', 'jpeg', 'png', 'webp', 'gif']:
                     ext = 'jpg'
                 image_filename = f"{slug}.{ext}"
-                local_path = f"blog/images/{image_filename}"
+                local_path = f"{BLOG_DIR}/images/{image_filename}"
                 if download_image(image_url, local_path):
                     print(f"   → Image: {image_filename}")
                 else:
                     image_filename = None
         
         # Create HTML file
-        html_content = create_html_file(post, category, image_filename)
-        html_path = f"blog/{slug}.html"
+        try:
+            html_content = create_html_file(post, category, image_filename)
+        except MissingImageError as e:
+            print(f"   ✗ Missing image: {e}")
+            save_cache()
+            raise
+        html_path = f"{BLOG_DIR}/{slug}.html"
         with open(html_path, 'w') as f:
             f.write(html_content)
         print(f"   → Created: {html_path}")
@@ -233,10 +231,20 @@ def main():
         results.append({
             'title': title,
             'category': category,
-            'slug': slug
+            'slug': slug,
+            'date': post['date'],
+            'date_gmt': post.get('date_gmt'),
+            'excerpt': extract_text_content(content)[:160],
+            'image': f"images/{image_filename}" if image_filename else None
         })
         print()
     
+    save_cache()
+    
+    # Save categorization results for the archive/feed build
+    with open(UNCATEGORIZED_MANIFEST, 'w') as f:
+        json.dump({'total': len(results), 'successful': results}, f, indent=2)
+    
     # Print summary
     print("\n" + "="*60)
     print("📊 SUMMARY")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Add image loading hints to blog posts that are already published
+
+The importers add these hints when a post is generated; this applies the
+same image_hints helpers to the committed blog/*.html pages so migrated
+posts get them without a re-import: the hero gets width/height,
+fetchpriority="high" and a <link rel=preload>, and article images are
+lazy-loaded at normal priority. Safe to re-run.
+
+Usage: python scripts/apply_image_hints.py [page.html ...]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+
+from image_hints import (
+    MissingImageError, hero_image_html, lazy_load_images, preload_link, save_cache,
+)
+from site_files import SITE_ROOT
+
+# Config
+BLOG_DIR = os.path.join(SITE_ROOT, "blog")
+
+# Hero <img> markup of the importer templates: the transfer_blog.py and
+# process_uncategorized.py classes, or a bare <img> in a featured-image wrapper
+HERO_RE = re.compile(
+    r'<img\b[^>]*\bclass="(?:w-full h-64 md:h-96 object-cover rounded-xl shadow-lg|featured-image)"[^>]*>'
+    r'|(?<=<div class="featured-image">)\s*<img\b[^>]*>'
+)
+ARTICLE_RE = re.compile(r'(<article\b[^>]*>)(.*?)(</article>)', re.DOTALL)
+ICON_LINK_RE = re.compile(r'^([ \t]*)<link rel="icon"[^>]*>[ \t]*\n', re.MULTILINE)
+
+
+def attr(tag, name):
+    match = re.search(rf'\b{name}="([^"]*)"', tag)
+    return match.group(1) if match else ""
+
+
+def add_preload(text, src):
+    """Put the hero preload after the favicon link, as the templates do"""
+    link = preload_link(src)
+    if link in text:
+        return text
+    icon = ICON_LINK_RE.search(text)
+    if icon:
+        return text[:icon.end()] + f"{icon.group(1)}{link}\n" + text[icon.end():]
+    return text.replace("</head>", f"  {link}\n</head>", 1)
+
+
+def hint_page(text, page_dir):
+    """Page with hero and article image hints applied"""
+    hero = HERO_RE.search(text)
+    hero_tag = None
+    if hero:
+        hero_tag = hero.group(0).strip()
+        if 'fetchpriority=' not in hero_tag:
+            start = hero.start() + hero.group(0).index(hero_tag)
+            end = start + len(hero_tag)
+            src = attr(hero_tag, 'src')
+            hero_tag = hero_image_html(src, attr(hero_tag, 'alt'), attr(hero_tag, 'class'), page_dir)
+            text = text[:start] + hero_tag + text[end:]
+        text = add_preload(text, attr(hero_tag, 'src'))
+
+    def _article(match):
+        # Some templates put the hero inside <article>; keep it eager
+        parts = match.group(2).split(hero_tag) if hero_tag else [match.group(2)]
+        body = (hero_tag or "").join(lazy_load_images(part, page_dir) for part in parts)
+        return match.group(1) + body + match.group(3)
+
+    return ARTICLE_RE.sub(_article, text, count=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add image loading hints to published blog posts")
+    parser.add_argument("pages", nargs="*", help="pages to update (default: blog/*.html)")
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(os.path.join(BLOG_DIR, "*.html")))
+    updated = []
+    failed = []
+    for path in pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            new_text = hint_page(text, os.path.dirname(os.path.abspath(path)))
+        except MissingImageError as e:
+            failed.append(path)
+            print(f"  ✗ {os.path.relpath(path, SITE_ROOT)}: {e}")
+            continue
+        if new_text != text:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_text)
+            updated.append(path)
+            print(f"  ✓ {os.path.relpath(path, SITE_ROOT)}")
+    save_cache()
+
+    print(f"\nUpdated {len(updated)} of {len(pages)} pages, {len(failed)} with missing images")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Build paginated blog archives and feeds from the post manifests
+
+Reads the categorization results saved by transfer_blog.py and
+process_uncategorized.py, sorts every post once, and in a single pass
+groups them into per-category and per-year archives plus JSON Feed and
+RSS feeds. Card and feed images use the R2 copy recorded by
+sync_r2_images.py when there is one. The blog index gets links to every
+archive and both feeds.
+
+Archive pages hold a fixed number of posts and are numbered from the
+oldest post, so page/1/ never changes once full; new posts only land on
+the archive's landing page. Each output is keyed by its membership and
+only re-rendered when that key changes.
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape as xml_escape
+from zoneinfo import ZoneInfo
+
+from categories import DEFAULT_CATEGORY, category_slug
+from site_files import SITE_ROOT, load_json, save_json
+
+# Config
+SITE_URL = "https://www.truelegacyhomes.com"
+BLOG_DIR = os.path.join(SITE_ROOT, "blog")
+MANIFESTS = [
+    os.path.join(BLOG_DIR, "manifest.json"),
+    os.path.join(BLOG_DIR, "uncategorized-manifest.json"),
+]
+BLOG_INDEX = os.path.join(BLOG_DIR, "index.html")
+R2_MANIFEST = os.path.join(SITE_ROOT, "scripts", "r2-manifest.json")
+STATE_FILE = os.path.join(SITE_ROOT, ".cache", "archives.json")
+
+PAGE_SIZE = 12
+FEED_SIZE = 20
+DEFAULT_IMAGE = "/images/TOP-495x400.png"
+
+# WordPress "date" is site-local time with no offset; "date_gmt" is UTC
+SITE_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+FEED_TITLE = "True Legacy Homes Blog"
+FEED_LINKS = (
+    f'<link rel="alternate" type="application/feed+json" title="{FEED_TITLE}" href="/blog/feed.json">\n'
+    f'  <link rel="alternate" type="application/rss+xml" title="{FEED_TITLE}" href="/blog/feed.xml">'
+)
+
+# Generated region of blog/index.html, inserted before the post grid
+INDEX_LINKS_RE = re.compile(r'[ \t]*<!-- Archive Links -->.*?<!-- /Archive Links -->\n', re.DOTALL)
+INDEX_LINKS_ANCHOR = "  <!-- Blog Grid -->"
+FEED_DESCRIPTION = "Expert tips on estate sales, senior care placement, and home selling in Southern California."
+
+
+def read_page_metadata(slug):
+    """Fill in fields older manifests lack from the published post itself"""
+    path = os.path.join(BLOG_DIR, f"{slug}.html")
+    with open(path, 'r', encoding='utf-8') as f:
+        page = f.read()
+    description = re.search(r'<meta name="description" content="([^"]*)"', page)
+    image = re.search(r'<meta property="og:image" content="([^"]*)"', page)
+    return {
+        'excerpt': html.unescape(description.group(1)) if description else "",
+        'image': image.group(1) if image else None,
+    }
+
+
+def published_at(post):
+    """Timezone-aware publish time, in the site's local zone"""
+    if post.get('date_gmt'):
+        published = datetime.fromisoformat(post['date_gmt'].replace('Z', ''))
+        return published.replace(tzinfo=timezone.utc).astimezone(SITE_TIMEZONE)
+    published = datetime.fromisoformat(post['date'].replace('Z', '+00:00'))
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=SITE_TIMEZONE)
+    return published
+
+
+def load_r2_images():
+    """Map of blog image file name -> R2 URL, from the last image sync"""
+    manifest = load_json(R2_MANIFEST)
+    public_url = manifest.get('public_url')
+    if not public_url:
+        return {}
+    return {
+        name: f"{public_url}/{entry['key']}"
+        for name, entry in manifest.get('objects', {}).items() if 'key' in entry
+    }
+
+
+def load_posts():
+    """All published posts from the manifests, keyed by slug"""
+    r2_images = load_r2_images()
+    posts = {}
+    for manifest_path in MANIFESTS:
+        if not os.path.exists(manifest_path):
+            continue
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        for entry in manifest.get('successful', []):
+            if not os.path.exists(os.path.join(BLOG_DIR, f"{entry['slug']}.html")):
+                continue
+            post = dict(entry)
+            if not all(k in post for k in ('excerpt', 'image')):
+                page = read_page_metadata(post['slug'])
+                post.setdefault('excerpt', page['excerpt'])
+                post.setdefault('image', page['image'])
+            # Older manifests only came from the WordPress Estate Sales category
+            post['category'] = post.get('category') or DEFAULT_CATEGORY
+            post['published'] = published_at(post)
+            post['image_url'] = image_url(post['image'], r2_images)
+            posts[post['slug']] = post
+    return list(posts.values())
+
+
+def image_url(image, r2_images=None):
+    """Public URL for a manifest image path (relative to blog/)
+
+    Blog images already synced to R2 resolve to their R2 URL.
+    """
+    if not image:
+        return DEFAULT_IMAGE
+    if image.startswith(('http://', 'https://')):
+        return image
+    if image.startswith('/'):
+        url = image
+    elif image.startswith('../'):
+        url = '/' + image[3:]
+    else:
+        url = f"/blog/{image}"
+    if url.startswith('/blog/images/') and r2_images:
+        synced = r2_images.get(url[len('/blog/images/'):])
+        if synced:
+            return synced
+    # Some migrated posts point at images that were never downloaded
+    if not os.path.isfile(os.path.join(SITE_ROOT, url.lstrip('/'))):
+        return DEFAULT_IMAGE
+    return url
+
+
+def paginate(posts):
+    """Split newest-first posts into fixed-size pages numbered from the oldest"""
+    oldest_first = posts[::-1]
+    return [oldest_first[i:i + PAGE_SIZE] for i in range(0, len(oldest_first), PAGE_SIZE)]
+
+
+def page_path(base, number, count):
+    """URL path of page `number` of `count`; the newest page is the landing page"""
+    if number == count:
+        return base
+    return f"{base}page/{number}/"
+
+
+def render_card(post):
+    """Post card matching the blog index grid"""
+    title = html.escape(post['title'])
+    return f'''
+        <a href="/blog/{post['slug']}.html" class="block bg-white rounded-xl overflow-hidden shadow-sm hover:shadow-lg transition">
+          <img src="{post['image_url']}" alt="{title}" class="h-48 w-full object-cover" loading="lazy" decoding="async">
+          <div class="p-6">
+            <div class="flex items-center gap-2 mb-3">
+              <span class="text-xs bg-tlh-teal/10 text-tlh-teal px-2 py-1 rounded-full">{html.escape(post['category'])}</span>
+              <span class="text-base text-gray-700">{post['published'].strftime('%B %d, %Y')}</span>
+            </div>
+            <h3 class="text-xl font-bold mb-2 text-tlh-dark">{title}</h3>
+            <p class="text-gray-700 mb-4">{html.escape(post['excerpt'])}</p>
+            <span class="text-tlh-teal font-semibold">Read more →</span>
+          </div>
+        </a>'''
+
+
+def render_archive(heading, description, url, posts, newer, older, categories):
+    """Archive page HTML: one page of post cards plus pagination links"""
+    cards = "".join(render_card(p) for p in reversed(posts))
+    nav = "".join(
+        f'\n        <a href="/blog/category/{slug}/" class="text-tlh-teal font-semibold hover:underline">{html.escape(name)}</a>'
+        for name, slug in categories
+    )
+    pager = ""
+    if newer:
+        pager += f'\n        <a href="{newer}" class="text-tlh-teal font-semibold hover:underline">← Newer posts</a>'
+    if older:
+        pager += f'\n        <a href="{older}" class="text-tlh-teal font-semibold hover:underline">Older posts →</a>'
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>{html.escape(heading)} | True Legacy Homes</title>
+  <meta name="description" content="{html.escape(description, quote=True)}">
+  <meta name="robots" content="index, follow">
+  <link rel="canonical" href="{SITE_URL}{url}">
+  {FEED_LINKS}
+  <link rel="icon" href="/images/favicon.png">
+  <link rel="stylesheet" href="/css/tailwind.min.css">
+</head>
+<body class="bg-white text-gray-800 text-base leading-relaxed">
+
+  <!-- Navigation -->
+  <nav class="bg-white shadow-sm sticky top-0 z-50">
+    <div class="max-w-6xl mx-auto px-4 py-4 flex justify-between items-center">
+      <a href="/"><img src="/images/tlhLOGO.png" alt="True Legacy Homes" class="h-16 md:h-20 w-auto"></a>
+      <a href="/blog/" class="text-tlh-teal font-semibold hover:underline">← All Articles</a>
+    </div>
+  </nav>
+
+  <section class="bg-gradient-to-br from-tlh-warm to-white py-16">
+    <div class="max-w-6xl mx-auto px-4 text-center">
+      <h1 class="text-4xl md:text-5xl font-bold text-tlh-dark mb-4">{html.escape(heading)}</h1>
+      <p class="text-xl text-gray-700 max-w-2xl mx-auto">{html.escape(description)}</p>
+    </div>
+  </section>
+
+  <section class="py-12 bg-gray-50">
+    <div class="max-w-6xl mx-auto px-4">
+      <div class="flex flex-wrap gap-6 mb-8">{nav}
+      </div>
+      <div class="grid md:grid-cols-2 lg:grid-cols-3 gap-8">{cards}
+      </div>
+      <div class="flex justify-between mt-12">{pager}
+      </div>
+    </div>
+  </section>
+
+</body>
+</html>
+'''
+
+
+def render_json_feed(posts):
+    """JSON Feed 1.1 document for the newest posts"""
+    items = []
+    for p in posts:
+        url = f"{SITE_URL}/blog/{p['slug']}.html"
+        image = p['image_url']
+        items.append({
+            'id': url,
+            'url': url,
+            'title': p['title'],
+            'content_text': p['excerpt'],
+            'summary': p['excerpt'],
+            'image': image if image.startswith('http') else SITE_URL + image,
+            'date_published': p['published'].isoformat(),
+            'tags': [p['category']],
+        })
+    feed = {
+        'version': "https://jsonfeed.org/version/1.1",
+        'title': FEED_TITLE,
+        'description': FEED_DESCRIPTION,
+        'home_page_url': f"{SITE_URL}/blog/",
+        'feed_url': f"{SITE_URL}/blog/feed.json",
+        'items': items,
+    }
+    return json.dumps(feed, indent=2, ensure_ascii=False) + "\n"
+
+
+def render_rss(posts):
+    """RSS 2.0 document for the newest posts"""
+    items = ""
+    for p in posts:
+        url = f"{SITE_URL}/blog/{p['slug']}.html"
+        items += f'''
+    <item>
+      <title>{xml_escape(p['title'])}</title>
+      <link>{url}</link>
+      <guid>{url}</guid>
+      <description>{xml_escape(p['excerpt'])}</description>
+      <category>{xml_escape(p['category'])}</category>
+      <pubDate>{format_datetime(p['published'])}</pubDate>
+    </item>'''
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>{FEED_TITLE}</title>
+    <link>{SITE_URL}/blog/</link>
+    <atom:link href="{SITE_URL}/blog/feed.xml" rel="self" type="application/rss+xml"/>
+    <description>{xml_escape(FEED_DESCRIPTION)}</description>{items}
+  </channel>
+</rss>
+'''
+
+
+def render_index_links(categories, years):
+    """Archive and feed links section for the blog index"""
+    link_class = "text-tlh-teal font-semibold hover:underline"
+    topics = "".join(
+        f'\n        <a href="/blog/category/{slug}/" class="{link_class}">{html.escape(name)}</a>'
+        for name, slug in categories
+    )
+    year_links = "".join(
+        f'\n        <a href="/blog/archive/{year}/" class="{link_class}">{year}</a>'
+        for year in years
+    )
+    return f'''  <!-- Archive Links -->
+  <section class="py-12 bg-white">
+    <div class="max-w-6xl mx-auto px-4">
+      <h2 class="text-2xl font-bold mb-4">Browse by Topic</h2>
+      <div class="flex flex-wrap gap-6 mb-8">{topics}
+      </div>
+      <h2 class="text-2xl font-bold mb-4">Browse by Year</h2>
+      <div class="flex flex-wrap gap-6 mb-8">{year_links}
+      </div>
+      <p class="text-gray-700">Follow new articles: <a href="/blog/feed.xml" class="{link_class}">RSS</a> · <a href="/blog/feed.json" class="{link_class}">JSON Feed</a></p>
+    </div>
+  </section>
+  <!-- /Archive Links -->
+'''
+
+
+def update_blog_index(categories, years, path=BLOG_INDEX):
+    """Refresh the blog index's archive links and feed <link>s; True if it changed"""
+    if not os.path.exists(path):
+        return False
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    links = render_index_links(categories, years)
+    if INDEX_LINKS_RE.search(text):
+        new_text = INDEX_LINKS_RE.sub(lambda m: links, text, count=1)
+    else:
+        new_text = text.replace(INDEX_LINKS_ANCHOR, links + "\n" + INDEX_LINKS_ANCHOR, 1)
+    head = new_text.split('</head>', 1)[0]
+    if 'href="/blog/feed.json"' not in head:
+        new_text = re.sub(r'[ \t]*</head>', lambda m: f"  {FEED_LINKS}\n{m.group(0)}", new_text, count=1)
+    if new_text == text:
+        return False
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(new_text)
+    return True
+
+
+def membership_key(*parts):
+    """Hash of everything that determines an output's content"""
+    def _default(value):
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+    data = json.dumps(parts, sort_keys=True, default=_default)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def plan_outputs(posts):
+    """Map output path -> (membership key, render function) in one pass"""
+    posts.sort(key=lambda p: p['published'], reverse=True)
+
+    archives = {}
+    for post in posts:
+        cat = post['category']
+        archives.setdefault(('category', cat), []).append(post)
+        archives.setdefault(('year', post['published'].year), []).append(post)
+
+    categories = sorted(
+        (name, category_slug(name)) for kind, name in archives if kind == 'category'
+    )
+
+    outputs = {}
+    for (kind, name), members in archives.items():
+        if kind == 'category':
+            base = f"/blog/category/{category_slug(name)}/"
+            heading = name
+            description = f"{name} articles from True Legacy Homes."
+        else:
+            base = f"/blog/archive/{name}/"
+            heading = f"Articles from {name}"
+            description = f"Every True Legacy Homes article published in {name}."
+        pages = paginate(members)
+        for number, chunk in enumerate(pages, 1):
+            url = page_path(base, number, len(pages))
+            newer = page_path(base, number + 1, len(pages)) if number < len(pages) else None
+            older = page_path(base, number - 1, len(pages)) if number > 1 else None
+            summary = [(p['slug'], p['title'], p['published'], p['category'], p['excerpt'], p['image_url'])
+                       for p in chunk]
+            key = membership_key(heading, description, url, summary, newer, older, categories)
+            render = (lambda h=heading, d=description, u=url, c=chunk, n=newer, o=older:
+                      render_archive(h, d, u, c, n, o, categories))
+            outputs[url.lstrip('/') + "index.html"] = (key, render)
+
+    latest = posts[:FEED_SIZE]
+    feed_key = membership_key([(p['slug'], p['title'], p['published'], p['category'], p['excerpt'], p['image_url'])
+                               for p in latest])
+    outputs["blog/feed.json"] = (feed_key, lambda: render_json_feed(latest))
+    outputs["blog/feed.xml"] = (feed_key, lambda: render_rss(latest))
+    return outputs
+
+
+def remove_output(rel_path):
+    """Delete a stale archive page and any directories it leaves empty"""
+    path = os.path.join(SITE_ROOT, rel_path)
+    if os.path.exists(path):
+        os.remove(path)
+    parent = os.path.dirname(path)
+    while parent != BLOG_DIR and os.path.isdir(parent) and not os.listdir(parent):
+        shutil.rmtree(parent)
+        parent = os.path.dirname(parent)
+
+
+def build(posts):
+    """Write outputs whose membership changed; returns (written, unchanged, removed)"""
+    state = load_json(STATE_FILE)
+    outputs = plan_outputs(posts)
+    written, unchanged = [], []
+
+    for rel_path, (key, render) in sorted(outputs.items()):
+        path = os.path.join(SITE_ROOT, rel_path)
+        if state.get(rel_path) == key and os.path.exists(path):
+            unchanged.append(rel_path)
+            continue
+        content = render()
+        existing = None
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = f.read()
+        if content != existing:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            written.append(rel_path)
+        else:
+            unchanged.append(rel_path)
+
+    removed = [rel_path for rel_path in state if rel_path not in outputs]
+    for rel_path in removed:
+        remove_output(rel_path)
+
+    save_json(STATE_FILE, {rel_path: key for rel_path, (key, _) in outputs.items()})
+
+    categories = sorted({(p['category'], category_slug(p['category'])) for p in posts})
+    years = sorted({p['published'].year for p in posts}, reverse=True)
+    if update_blog_index(categories, years):
+        written.append(os.path.relpath(BLOG_INDEX, SITE_ROOT))
+    return written, unchanged, removed
+
+
+def main():
+    posts = load_posts()
+    print(f"📚 Building archives for {len(posts)} posts...")
+
+    written, unchanged, removed = build(posts)
+
+    category_counts = {}
+    for p in posts:
+        category_counts[p['category']] = category_counts.get(p['category'], 0) + 1
+    print("\nPosts by category:")
+    for cat, count in sorted(category_counts.items()):
+        print(f"  • {cat}: {count}")
+
+    print(f"\nWritten: {len(written)}, unchanged: {len(unchanged)}, removed: {len(removed)}")
+    for rel_path in written:
+        print(f"  ✓ {rel_path}")
+    for rel_path in removed:
+        print(f"  ✗ {rel_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Blog category names, plus keyword-based categorization for posts imported
+without a usable WordPress category
+"""
+import re
+
+# Category mapping keywords, checked in order
+CATEGORY_KEYWORDS = {
+    "Real Estate": ["realtor", "home buying", "selling home", "real estate", "property", "cash offer", "home sale"],
+    "Renovation": ["renovation", "repair", "remodel", "contractor", "construction"],
+    "Senior Moving": ["senior", "assisted living", "downsizing", "elder", "aging", "retirement", "care placement"],
+    "Antique Collectibles": ["antique", "collectible", "vintage", "mid-century", "modern furniture", "barbie", "kitchenware", "pottery", "fine art", "rare"],
+    "News": ["announcement", "news"],
+    "Estate Sales": ["estate sale", "sale at", "pricing", "selling items", "treasure", "shopper"]  # default fallback
+}
+
+DEFAULT_CATEGORY = "Estate Sales"
+
+# Whole words/phrases only (optionally plural), so "rare" skips "rarely"
+CATEGORY_PATTERNS = [
+    (category, re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in keywords) + r')s?\b'))
+    for category, keywords in CATEGORY_KEYWORDS.items()
+]
+
+def categorize_post(title, content):
+    """Determine category based on title and content"""
+    text = (title + " " + content).lower()
+    
+    # Strip HTML tags from content for analysis
+    text = re.sub(r'<[^>]+>', ' ', text)
+    
+    # First category with a matching keyword wins
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(text):
+            return category
+    
+    # Default to Estate Sales
+    return DEFAULT_CATEGORY
+
+def category_slug(category):
+    """URL slug for a category name, e.g. Senior Moving -> senior-moving"""
+    return re.sub(r'[^a-z0-9]+', '-', category.lower()).strip('-')
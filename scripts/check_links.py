@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Offline internal link and asset checker for the static site
+
+Parses every HTML page into a link graph (cached per file hash, so only
+changed pages are re-parsed), resolves each internal href/src against the
+publish tree and the _redirects rules, and reports broken links, links
+that cost a redirect hop, and canonicals that do not point at the page's
+own URL on the production domain.
+
+Usage: python scripts/check_links.py [--json report.json] [--strict]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, unquote
+
+from site_files import SITE_ROOT, file_hash, load_json, save_json, walk_pages
+
+# Config
+SITE_URL = "https://www.truelegacyhomes.com"
+SITE_HOSTS = {"www.truelegacyhomes.com", "truelegacyhomes.com"}
+REDIRECTS_FILE = os.path.join(SITE_ROOT, "_redirects")
+CACHE_FILE = os.path.join(SITE_ROOT, ".cache", "link-graph.json")
+
+# Pages that are not meant to be indexed and need no canonical
+CANONICAL_EXEMPT = {"404.html", "admin/index.html", "thank-you/index.html"}
+
+# Give up following a redirect chain after this many hops
+MAX_HOPS = 5
+
+# Statuses that send the browser elsewhere; 200 rules are rewrites
+REDIRECT_STATUSES = {"301", "302", "303", "307", "308"}
+
+SKIP_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'sms:')
+
+
+class LinkCollector(HTMLParser):
+    """Collect outgoing references and the canonical URL of one page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []  # [tag, url]
+        self.canonical = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict((k, v or "") for k, v in attrs)
+        if tag == "link":
+            rel = a.get("rel", "").lower().split()
+            if "canonical" in rel:
+                self.canonical = a.get("href")
+            elif any(r in rel for r in ("stylesheet", "icon", "preload")):
+                self.links.append(["link", a.get("href", "")])
+        elif tag == "a" and a.get("href"):
+            self.links.append(["a", a["href"]])
+        elif tag in ("img", "script", "iframe") and a.get("src"):
+            self.links.append([tag, a["src"]])
+        elif tag == "source" and a.get("srcset"):
+            self.links.append(["source", a["srcset"].split(",")[0].split()[0]])
+
+
+def parse_page(path):
+    """Parse one page into its link list and canonical"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    collector = LinkCollector()
+    collector.feed(data.decode('utf-8', errors='replace'))
+    return {
+        'hash': hashlib.sha256(data).hexdigest(),
+        'links': collector.links,
+        'canonical': collector.canonical,
+    }
+
+
+def load_redirects(path=REDIRECTS_FILE):
+    """Parse _redirects into (regex, target, status) rules, in file order"""
+    rules = []
+    if not os.path.exists(path):
+        return rules
+    with open(path, 'r') as f:
+        for line in f:
+            parts = line.split('#', 1)[0].split()
+            if len(parts) < 2:
+                continue
+            source, target = parts[0], parts[1]
+            status = parts[2].rstrip('!') if len(parts) > 2 else "301"
+            pattern = re.escape(source)
+            # "/dir/*" also matches "/dir" itself
+            if pattern.endswith(r'/\*'):
+                pattern = pattern[:-3] + r'(?:/(?P<splat>.*))?'
+            pattern = re.sub(r':(\w+)', r'(?P<\1>[^/]+)', pattern)
+            rules.append((re.compile(pattern + r'$'), target, status))
+    return rules
+
+
+def page_url(rel_path):
+    """Public URL path a page file is served at"""
+    url = '/' + rel_path.replace(os.sep, '/')
+    if url.endswith('/index.html'):
+        url = url[:-len('index.html')]
+    return url
+
+
+def to_site_path(url, page_rel):
+    """Internal URL path for a reference, or None if it leaves the site"""
+    if url.startswith(SKIP_SCHEMES) or url.startswith('#') or not url.strip():
+        return None
+    parts = urlsplit(url.strip())
+    if parts.scheme or parts.netloc:
+        if parts.netloc not in SITE_HOSTS:
+            return None
+        path = parts.path or '/'
+    elif parts.path.startswith('/'):
+        path = parts.path
+    elif parts.path:
+        base = '/' + os.path.dirname(page_rel).replace(os.sep, '/')
+        path = os.path.normpath(os.path.join(base, parts.path)).replace(os.sep, '/')
+        if parts.path.endswith('/') and not path.endswith('/'):
+            path += '/'
+    else:
+        return None
+    return unquote(path)
+
+
+def lookup(path):
+    """How the static host answers a path: ("ok"|"slash"|None, file)"""
+    local = os.path.join(SITE_ROOT, path.lstrip('/'))
+    if path.endswith('/'):
+        index = os.path.join(local, "index.html")
+        return ("ok", index) if os.path.isfile(index) else (None, None)
+    if os.path.isfile(local):
+        return "ok", local
+    if os.path.isfile(os.path.join(local, "index.html")):
+        return "slash", path + '/'
+    if os.path.isfile(local + ".html"):
+        return "ok", local + ".html"
+    return None, None
+
+
+def match_redirect(path, rules):
+    """Target of the first _redirects rule that matches the path"""
+    for regex, target, status in rules:
+        m = regex.match(path)
+        if m:
+            for name, value in m.groupdict().items():
+                target = target.replace(':' + name, value or '')
+            return target, status
+    return None, None
+
+
+def resolve(path, rules):
+    """Follow a path through the tree and redirects; returns (hops, final, ok)"""
+    hops = []
+    for _ in range(MAX_HOPS):
+        state, found = lookup(path)
+        if state == "ok":
+            return hops, path, True
+        if state == "slash":
+            hops.append(found)
+            path = found
+            continue
+        target, status = match_redirect(path, rules)
+        if target is None:
+            return hops, path, False
+        if target.startswith(('http://', 'https://')):
+            if status in REDIRECT_STATUSES:
+                hops.append(target)
+            return hops, target, True
+        target_path = target.split('?')[0].split('#')[0]
+        if status not in REDIRECT_STATUSES:
+            # Rewrite: served in place from the target, no extra round trip
+            state, _ = lookup(target_path)
+            return hops, target_path, state == "ok"
+        hops.append(target)
+        path = target_path
+    return hops, path, False
+
+
+def build_graph(workers=None):
+    """Link graph for every page, re-parsing only files whose hash changed"""
+    cache = load_json(CACHE_FILE)
+    graph = {}
+    stale = []
+    for rel in walk_pages():
+        entry = cache.get(rel)
+        if entry and entry['hash'] == file_hash(os.path.join(SITE_ROOT, rel)):
+            graph[rel] = entry
+        else:
+            stale.append(rel)
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            paths = [os.path.join(SITE_ROOT, rel) for rel in stale]
+            for rel, entry in zip(stale, pool.map(parse_page, paths, chunksize=16)):
+                graph[rel] = entry
+    save_json(CACHE_FILE, graph, indent=None)
+    return graph, len(stale)
+
+
+def check_canonical(rel, canonical):
+    """Problem with a page's canonical URL, or None if it is correct"""
+    expected = SITE_URL + page_url(rel)
+    if not canonical:
+        return f"missing (expected {expected})"
+    if canonical != expected:
+        return f"{canonical} (expected {expected})"
+    return None
+
+
+def check_site(rules, workers=None):
+    """Resolve every internal reference in the link graph"""
+    graph, parsed = build_graph(workers)
+    resolved = {}
+    broken = []
+    redirected = []
+    canonicals = []
+    for rel in sorted(graph):
+        entry = graph[rel]
+        for tag, url in entry['links']:
+            path = to_site_path(url, rel)
+            if path is None:
+                continue
+            if path not in resolved:
+                resolved[path] = resolve(path, rules)
+            hops, final, ok = resolved[path]
+            if not ok:
+                broken.append({'page': rel, 'tag': tag, 'url': url, 'path': final})
+            elif hops:
+                redirected.append({'page': rel, 'tag': tag, 'url': url, 'hops': hops})
+        problem = None if rel in CANONICAL_EXEMPT else check_canonical(rel, entry['canonical'])
+        if problem:
+            canonicals.append({'page': rel, 'problem': problem})
+    return {
+        'pages': len(graph),
+        'parsed': parsed,
+        'broken': broken,
+        'redirected': redirected,
+        'canonicals': canonicals,
+    }
+
+
+def summarize(items, key):
+    """Count occurrences of a field, most common first"""
+    counts = {}
+    for item in items:
+        counts[item[key]] = counts.get(item[key], 0) + 1
+    return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check internal links, redirects and canonicals")
+    parser.add_argument("--json", dest="json_out", help="write the full report as JSON")
+    parser.add_argument("--strict", action="store_true", help="fail on redirect hops too")
+    parser.add_argument("--workers", type=int, help="parallel worker processes")
+    args = parser.parse_args()
+
+    report = check_site(load_redirects(), workers=args.workers)
+
+    print(f"🔗 Checked {report['pages']} pages ({report['parsed']} re-parsed)")
+    print(f"   Broken: {len(report['broken'])}, "
+          f"redirect hops: {len(report['redirected'])}, "
+          f"wrong canonicals: {len(report['canonicals'])}")
+
+    if report['broken']:
+        print("\n✗ Broken links (by target):")
+        for url, count in summarize(report['broken'], 'path')[:25]:
+            print(f"  • {url} ({count} links)")
+    if report['redirected']:
+        print("\n↪ Redirected links (by href):")
+        for url, count in summarize(report['redirected'], 'url')[:25]:
+            print(f"  • {url} ({count} links)")
+    if report['canonicals']:
+        print("\n✗ Wrong canonicals:")
+        for c in report['canonicals'][:25]:
+            print(f"  • {c['page']}: {c['problem']}")
+        if len(report['canonicals']) > 25:
+            print(f"  ... and {len(report['canonicals']) - 25} more")
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nJSON report saved to {args.json_out}")
+
+    if report['broken'] or report['canonicals'] or (args.strict and report['redirected']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Image loading hints for generated blog pages
+
+Reads image dimensions from file headers only (no full decode), caches them
+by content hash, and builds the hero <img>/<link rel=preload> markup so the
+featured image reserves its space and starts downloading early.
+"""
+import os
+import re
+import struct
+import sys
+
+from site_files import SITE_ROOT, file_hash, is_remote, load_json, save_json
+
+# Config
+CACHE_FILE = os.path.join(SITE_ROOT, ".cache", "image-dimensions.json")
+
+# Bytes read from the start of a file; enough for PNG/GIF/WebP headers
+HEADER_BYTES = 64
+
+_cache = None
+
+
+class MissingImageError(Exception):
+    """Raised when a page references a local image that does not exist"""
+
+
+def resolve_image(src, page_dir):
+    """Map an <img> src to a file path on disk, relative to the page"""
+    src = src.split('?')[0].split('#')[0]
+    if src.startswith('/'):
+        return os.path.join(SITE_ROOT, src.lstrip('/'))
+    return os.path.normpath(os.path.join(page_dir, src))
+
+
+def _png_size(f, head):
+    """PNG: width/height are the first two fields of the IHDR chunk"""
+    if head[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', head[16:24])
+
+
+def _gif_size(f, head):
+    """GIF: logical screen width/height follow the 6-byte signature"""
+    return struct.unpack('<HH', head[6:10])
+
+
+def _webp_size(f, head):
+    """WebP: lossy (VP8), lossless (VP8L) and extended (VP8X) headers"""
+    chunk = head[12:16]
+    if chunk == b'VP8 ':
+        w, h = struct.unpack('<HH', head[26:30])
+        return w & 0x3fff, h & 0x3fff
+    if chunk == b'VP8L':
+        b = head[21:25]
+        w = 1 + (((b[1] & 0x3f) << 8) | b[0])
+        h = 1 + (((b[3] & 0x0f) << 10) | (b[2] << 2) | ((b[1] & 0xc0) >> 6))
+        return w, h
+    if chunk == b'VP8X':
+        w = 1 + int.from_bytes(head[24:27], 'little')
+        h = 1 + int.from_bytes(head[27:30], 'little')
+        return w, h
+    return None
+
+
+def _jpeg_size(f, head):
+    """JPEG: walk the marker segments until the first SOFn frame header"""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        # Standalone markers carry no length field
+        if marker in (0x01, 0xd8) or 0xd0 <= marker <= 0xd7:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        # SOF0-SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xc0 <= marker <= 0xcf and marker not in (0xc4, 0xc8, 0xcc):
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            h, w = struct.unpack('>HH', data[1:5])
+            return w, h
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_dimensions(path):
+    """Return (width, height) from the image header, or None if unknown"""
+    with open(path, 'rb') as f:
+        head = f.read(HEADER_BYTES)
+        if head.startswith(b'\x89PNG\r\n\x1a\n'):
+            return _png_size(f, head)
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return _gif_size(f, head)
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return _webp_size(f, head)
+        if head[:2] == b'\xff\xd8':
+            return _jpeg_size(f, head)
+    return None
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = load_json(CACHE_FILE)
+    return _cache
+
+
+def save_cache():
+    """Write the dimension cache back to disk"""
+    if _cache is not None:
+        save_json(CACHE_FILE, _cache)
+
+
+def image_dimensions(path):
+    """Cached (width, height) for a local image, keyed by content hash"""
+    if not os.path.isfile(path):
+        raise MissingImageError(f"Image not found: {path}")
+    cache = _load_cache()
+    key = file_hash(path)
+    if key not in cache:
+        size = read_dimensions(path)
+        cache[key] = list(size) if size else None
+    size = cache[key]
+    return tuple(size) if size else None
+
+
+def hero_image_html(src, alt, css_class, page_dir):
+    """Featured <img> with dimensions and high fetch priority"""
+    attrs = f'src="{src}" alt="{alt}"'
+    if not is_remote(src):
+        size = image_dimensions(resolve_image(src, page_dir))
+        if size:
+            attrs += f' width="{size[0]}" height="{size[1]}"'
+    if css_class:
+        attrs += f' class="{css_class}"'
+    return f'<img {attrs} fetchpriority="high" decoding="async">'
+
+
+def preload_link(src):
+    """<link rel=preload> for the hero image, placed in <head>"""
+    return f'<link rel="preload" as="image" href="{src}" fetchpriority="high">'
+
+
+IMG_TAG_RE = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+SRC_RE = re.compile(r'\bsrc\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+# Priority hints WordPress adds to body images (loading="eager", fetchpriority="high")
+PRIORITY_ATTR_RE = re.compile(
+    r'\s+(?:loading|fetchpriority)\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE
+)
+
+
+def lazy_load_images(content, page_dir):
+    """Make body images lazy and low priority, and check local ones exist
+
+    Only the hero should be fetched eagerly at high priority, so any
+    loading/fetchpriority WordPress put on body images is replaced.
+    """
+    def _rewrite(match):
+        tag = match.group(0)
+        src = SRC_RE.search(tag)
+        if src and not is_remote(src.group(1)):
+            path = resolve_image(src.group(1), page_dir)
+            if not os.path.isfile(path):
+                raise MissingImageError(f"Image not found: {path}")
+        tag = PRIORITY_ATTR_RE.sub('', tag)
+        if tag.endswith('/>'):
+            return tag[:-2].rstrip() + ' loading="lazy" />'
+        return tag[:-1].rstrip() + ' loading="lazy">'
+
+    return IMG_TAG_RE.sub(_rewrite, content)
+
+
+def main():
+    """Print dimensions for the given image files"""
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} <image> [image ...]")
+        sys.exit(1)
+    for path in sys.argv[1:]:
+        size = image_dimensions(path)
+        print(f"{path}: {size[0]}x{size[1]}" if size else f"{path}: unknown format")
+    save_cache()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Page-weight budget auditor for the published static site
+
+Walks the publish tree, resolves every stylesheet, script, image and
+third-party script each HTML page references, and checks total and
+critical-path bytes per page and for the whole deploy against the budgets
+in scripts/page-budgets.json. Exits non-zero when any budget is broken.
+
+Usage: python scripts/page_weight.py [--json report.json] [--html report.html]
+"""
+import argparse
+import fnmatch
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, unquote
+
+from site_files import SITE_ROOT, is_remote, walk_site
+
+# Config
+BUDGETS_FILE = os.path.join(SITE_ROOT, "scripts", "page-budgets.json")
+
+# Number of offenders listed in the summary and reports
+TOP_N = 15
+
+# <link rel=preload as=...> values mapped to the asset kinds used in budgets
+PRELOAD_KINDS = {"style": "css", "script": "js", "image": "image", "font": "font"}
+
+
+class AssetCollector(HTMLParser):
+    """Collect the resources a page references, flagging render-blocking ones"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.assets = []  # (url, kind, critical)
+        self.in_head = True
+
+    def _add(self, url, kind, critical):
+        if url and not url.startswith(('data:', 'mailto:', 'tel:', 'javascript:', '#')):
+            self.assets.append((url.strip(), kind, critical))
+
+    def handle_starttag(self, tag, attrs):
+        a = dict((k, v or "") for k, v in attrs)
+        if tag == "body":
+            self.in_head = False
+        elif tag == "link":
+            rel = a.get("rel", "").lower().split()
+            if "stylesheet" in rel:
+                self._add(a.get("href"), "css", True)
+            elif "preload" in rel:
+                kind = a.get("as", "").lower()
+                self._add(a.get("href"), PRELOAD_KINDS.get(kind, kind or "preload"), True)
+            elif "icon" in rel:
+                self._add(a.get("href"), "image", False)
+        elif tag == "script" and a.get("src"):
+            # Scripts in <head> without async/defer block first render
+            blocking = self.in_head and "async" not in a and "defer" not in a \
+                and a.get("type") != "module"
+            self._add(a.get("src"), "js", blocking)
+        elif tag == "img":
+            self._add(a.get("src"), "image", a.get("fetchpriority") == "high")
+        elif tag == "source" and a.get("srcset"):
+            self._add(a.get("srcset").split(",")[0].split()[0], "image", False)
+
+
+def resolve_local(url, page_path):
+    """Map a same-site URL to a file on disk (None if it does not exist)"""
+    path = unquote(urlsplit(url).path)
+    if not path:
+        return None
+    if path.startswith('/'):
+        target = os.path.join(SITE_ROOT, path.lstrip('/'))
+    else:
+        target = os.path.normpath(os.path.join(os.path.dirname(page_path), path))
+    if os.path.isdir(target):
+        target = os.path.join(target, "index.html")
+    return target if os.path.isfile(target) else None
+
+
+def third_party_size(url, estimates):
+    """Estimated size of a third-party resource by longest URL prefix match"""
+    matches = [p for p in estimates if url.startswith(p)]
+    if not matches:
+        return None
+    return estimates[max(matches, key=len)]
+
+
+def load_budgets(path=BUDGETS_FILE):
+    """Read the checked-in budgets file"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def budgets_for(rel_path, budgets):
+    """Page budgets with any matching per-path overrides applied"""
+    limits = {k: budgets[k] for k in ("page_total_bytes", "page_critical_bytes")}
+    for pattern, override in budgets.get("overrides", {}).items():
+        if fnmatch.fnmatch(rel_path, pattern):
+            limits.update(override)
+    return limits
+
+
+def audit_page(page_path, budgets):
+    """Weigh one HTML page and the resources it pulls in"""
+    rel_path = os.path.relpath(page_path, SITE_ROOT)
+    html_bytes = os.path.getsize(page_path)
+    collector = AssetCollector()
+    with open(page_path, 'r', encoding='utf-8', errors='replace') as f:
+        collector.feed(f.read())
+
+    estimates = budgets.get("third_party_bytes", {})
+    defaults = budgets.get("third_party_default_bytes", {})
+    seen = set()
+    assets = []
+    missing = []
+    unknown = []
+    for url, kind, critical in collector.assets:
+        estimated = False
+        if is_remote(url):
+            key = url
+            size = third_party_size(url, estimates)
+            if size is None:
+                # Unlisted remote resource: fall back to a per-kind estimate
+                size = defaults.get(kind)
+                estimated = True
+            if size is None:
+                if url not in unknown:
+                    unknown.append(url)
+                continue
+            local = None
+        else:
+            local = resolve_local(url, page_path)
+            if local is None:
+                if url not in missing:
+                    missing.append(url)
+                continue
+            key = os.path.relpath(local, SITE_ROOT)
+            size = os.path.getsize(local)
+        if key in seen:
+            continue
+        seen.add(key)
+        assets.append({
+            'url': key,
+            'kind': kind,
+            'bytes': size,
+            'critical': critical,
+            'third_party': local is None,
+            'estimated': estimated,
+        })
+
+    total = html_bytes + sum(a['bytes'] for a in assets)
+    critical = html_bytes + sum(a['bytes'] for a in assets if a['critical'])
+    limits = budgets_for(rel_path, budgets)
+    violations = []
+    if total > limits["page_total_bytes"]:
+        violations.append(f"total {total} > {limits['page_total_bytes']}")
+    if critical > limits["page_critical_bytes"]:
+        violations.append(f"critical {critical} > {limits['page_critical_bytes']}")
+    if len(missing) > budgets.get("missing_assets_max", 0):
+        violations.append(f"{len(missing)} missing local assets")
+    for a in assets:
+        if not a['third_party'] and a['bytes'] > budgets["asset_max_bytes"]:
+            violations.append(f"asset {a['url']} {a['bytes']} > {budgets['asset_max_bytes']}")
+
+    return {
+        'page': rel_path,
+        'html_bytes': html_bytes,
+        'total_bytes': total,
+        'critical_bytes': critical,
+        'assets': sorted(assets, key=lambda a: -a['bytes']),
+        'missing': missing,
+        'unknown_third_party': unknown,
+        'violations': violations,
+    }
+
+
+def _audit_page_star(args):
+    return audit_page(*args)
+
+
+def audit_site(budgets, workers=None, exclude=()):
+    """Audit every page in parallel and total up the deploy"""
+    files = [(os.path.join(SITE_ROOT, rel), os.path.getsize(os.path.join(SITE_ROOT, rel)))
+             for rel in walk_site(exclude=exclude)]
+    pages = [p for p, _ in files if p.endswith('.html')]
+    deploy_bytes = sum(size for _, size in files)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_audit_page_star, [(p, budgets) for p in pages], chunksize=16))
+
+    violations = []
+    if deploy_bytes > budgets["deploy_total_bytes"]:
+        violations.append(f"deploy {deploy_bytes} > {budgets['deploy_total_bytes']}")
+
+    largest_files = sorted(
+        ({'path': os.path.relpath(p, SITE_ROOT), 'bytes': s} for p, s in files),
+        key=lambda f: -f['bytes'],
+    )[:TOP_N]
+
+    return {
+        'deploy_bytes': deploy_bytes,
+        'file_count': len(files),
+        'page_count': len(pages),
+        'budgets': budgets,
+        'violations': violations,
+        'pages_over_budget': sum(1 for r in results if r['violations']),
+        'missing_count': sum(len(r['missing']) for r in results),
+        'unknown_count': sum(len(r['unknown_third_party']) for r in results),
+        'largest_files': largest_files,
+        'pages': sorted(results, key=lambda r: -r['total_bytes']),
+    }
+
+
+def format_bytes(n):
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024 or unit == 'MB':
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def render_html(report):
+    """Standalone HTML version of the report"""
+    rows = ""
+    for r in report['pages'][:TOP_N]:
+        status = "✗ " + "; ".join(html.escape(v) for v in r['violations']) if r['violations'] else "✓"
+        rows += f'''
+      <tr>
+        <td>{html.escape(r['page'])}</td>
+        <td>{format_bytes(r['total_bytes'])}</td>
+        <td>{format_bytes(r['critical_bytes'])}</td>
+        <td>{len(r['missing'])}</td>
+        <td>{len(r['unknown_third_party'])}</td>
+        <td>{status}</td>
+      </tr>'''
+    unresolved = ""
+    for r in report['pages']:
+        if not (r['missing'] or r['unknown_third_party']):
+            continue
+        items = "".join(f"<li>missing: {html.escape(u)}</li>" for u in r['missing'])
+        items += "".join(f"<li>unmeasured: {html.escape(u)}</li>" for u in r['unknown_third_party'])
+        unresolved += f"\n    <h3>{html.escape(r['page'])}</h3>\n    <ul>{items}</ul>"
+    files = "".join(
+        f"\n      <li>{html.escape(f['path'])} — {format_bytes(f['bytes'])}</li>"
+        for f in report['largest_files']
+    )
+    deploy_status = "; ".join(report['violations']) or "within budget"
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <title>Page Weight Report | True Legacy Homes</title>
+  <style>
+    body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 2rem; color: #1e293b; }}
+    table {{ border-collapse: collapse; width: 100%; }}
+    th, td {{ text-align: left; padding: 0.4rem 0.75rem; border-bottom: 1px solid #e5e7eb; }}
+    th {{ background: #38b5ad; color: white; }}
+  </style>
+</head>
+<body>
+  <h1>Page Weight Report</h1>
+  <p>Deploy: {format_bytes(report['deploy_bytes'])} across {report['file_count']} files ({html.escape(deploy_status)})</p>
+  <p>Pages over budget: {report['pages_over_budget']} of {report['page_count']}</p>
+  <h2>Heaviest pages</h2>
+  <table>
+    <thead>
+      <tr><th>Page</th><th>Total</th><th>Critical path</th><th>Missing</th><th>Unmeasured</th><th>Budget</th></tr>
+    </thead>
+    <tbody>{rows}
+    </tbody>
+  </table>
+  <h2>Largest files</h2>
+  <ul>{files}
+  </ul>
+  <h2>Missing and unmeasured assets</h2>
+  <p>{report['missing_count']} missing local assets, {report['unknown_count']} third-party resources with no size estimate (counted as 0 bytes).</p>{unresolved}
+</body>
+</html>
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check page weight against budgets")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="budgets JSON file")
+    parser.add_argument("--json", dest="json_out", help="write the full report as JSON")
+    parser.add_argument("--html", dest="html_out", help="write an HTML summary report")
+    parser.add_argument("--workers", type=int, help="parallel worker processes")
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets)
+    outputs = [p for p in (args.json_out, args.html_out) if p]
+    report = audit_site(budgets, workers=args.workers, exclude=outputs)
+
+    print(f"📦 Deploy: {format_bytes(report['deploy_bytes'])} "
+          f"({report['file_count']} files, budget {format_bytes(budgets['deploy_total_bytes'])})")
+    print(f"📄 Pages: {report['page_count']}, over budget: {report['pages_over_budget']}")
+
+    print("\nHeaviest pages:")
+    for r in report['pages'][:TOP_N]:
+        mark = "✗" if r['violations'] else "✓"
+        print(f"  {mark} {r['page']}: {format_bytes(r['total_bytes'])} total, "
+              f"{format_bytes(r['critical_bytes'])} critical")
+
+    if report['missing_count'] or report['unknown_count']:
+        print(f"\nMissing local assets: {report['missing_count']}, "
+              f"unmeasured third-party (counted as 0 bytes): {report['unknown_count']}")
+        for r in report['pages']:
+            for url in r['missing']:
+                print(f"  ✗ {r['page']}: missing {url}")
+            for url in r['unknown_third_party']:
+                print(f"  ? {r['page']}: unmeasured {url}")
+
+    print("\nLargest files:")
+    for f in report['largest_files']:
+        print(f"  • {f['path']}: {format_bytes(f['bytes'])}")
+
+    if args.json_out:
+        with open(args.json_out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nJSON report saved to {args.json_out}")
+    if args.html_out:
+        with open(args.html_out, 'w', encoding='utf-8') as f:
+            f.write(render_html(report))
+        print(f"HTML report saved to {args.html_out}")
+
+    failed = report['violations'] or report['pages_over_budget']
+    if failed:
+        print("\n✗ Budget exceeded:")
+        for v in report['violations']:
+            print(f"  - {v}")
+        for r in report['pages']:
+            for v in r['violations']:
+                print(f"  - {r['page']}: {v}")
+        sys.exit(1)
+    print("\n✓ All pages within budget")
+
+
+if __name__ == "__main__":
+    main()
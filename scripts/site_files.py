@@ -0,0 +1,89 @@
+"""
+Shared helpers for walking and hashing the published site tree
+"""
+import hashlib
+import json
+import os
+import subprocess
+
+# Config
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Paths that are never part of the deploy
+SKIP_DIRS = {"node_modules", "__pycache__"}
+
+
+def _deployable(rel_path):
+    """False for hidden files/dirs and build-only directories"""
+    parts = rel_path.split('/')
+    return not any(p.startswith('.') or p in SKIP_DIRS for p in parts)
+
+
+def _git_files(root):
+    """Tracked and untracked-but-not-ignored files, or None outside a git checkout"""
+    try:
+        out = subprocess.run(
+            ['git', 'ls-files', '--cached', '--others', '--exclude-standard', '-z'],
+            cwd=root, capture_output=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return sorted(set(p for p in out.decode('utf-8').split('\0') if p))
+
+
+def _walk_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            yield os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, '/')
+
+
+def walk_site(root=SITE_ROOT, exclude=()):
+    """Relative paths of every deployable file, skipping gitignored ones"""
+    excluded = {os.path.abspath(p) for p in exclude}
+    files = _git_files(root)
+    if files is None:
+        files = _walk_files(root)
+    for rel_path in files:
+        path = os.path.join(root, rel_path)
+        if _deployable(rel_path) and os.path.isfile(path) and os.path.abspath(path) not in excluded:
+            yield rel_path
+
+
+def walk_pages(root=SITE_ROOT):
+    """Relative paths of every deployable HTML page"""
+    for rel_path in walk_site(root):
+        if rel_path.endswith('.html'):
+            yield rel_path
+
+
+def is_remote(url):
+    """True for absolute/protocol-relative URLs and data: URIs, which have no local file"""
+    return url.startswith(('http://', 'https://', '//', 'data:'))
+
+
+def load_json(path, default=None):
+    """Parsed JSON file, or default ({}) if it is missing or unreadable"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+def save_json(path, data, indent=2):
+    """Write data as JSON, creating the parent directory if needed"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=indent, sort_keys=True)
+        if indent is not None:
+            f.write('\n')
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
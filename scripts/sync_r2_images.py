@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Sync blog images to Cloudflare R2 and point blog posts at them
+
+Keeps a manifest of content hashes (scripts/r2-manifest.json), compares it
+against the ETags already in the bucket, and uploads only new or changed
+images, concurrently and with multipart for large files. Each object key
+carries a short content hash (photo.jpg -> photo-1a2b3c4d.jpg), so a changed
+image gets a new URL. Blog pages are then rewritten to serve every synced
+image from the R2 public URL.
+
+Works against any S3-compatible endpoint, so a local stand-in such as MinIO
+can be used for testing:
+
+  python scripts/sync_r2_images.py --endpoint http://localhost:9000
+
+Credentials come from R2_ACCESS_KEY_ID / R2_SECRET_ACCESS_KEY, and the R2
+endpoint from R2_ACCOUNT_ID unless --endpoint is given.
+"""
+import argparse
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+
+from site_files import SITE_ROOT, file_hash, load_json, save_json
+
+# Config
+IMAGES_DIR = os.path.join(SITE_ROOT, "blog", "images")
+BLOG_DIR = os.path.join(SITE_ROOT, "blog")
+MANIFEST_FILE = os.path.join(SITE_ROOT, "scripts", "r2-manifest.json")
+R2_BUCKET = "tlh-blog-images"
+R2_PUBLIC_URL = "https://images.truelegacyhomes.com"
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif', '.svg')
+
+# Files above the threshold go up as multipart uploads of CHUNK_SIZE parts.
+# The local ETag calculation must use the same chunk size to match R2.
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_WORKERS = 8
+
+# Keys include a content hash, so an object never changes and can be cached forever
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Length of the sha256 prefix in object keys
+KEY_HASH_LENGTH = 8
+
+
+def expected_etag(path, size):
+    """ETag S3/R2 will report for this file given our multipart settings"""
+    md5s = []
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            md5s.append(hashlib.md5(block))
+    if size < MULTIPART_THRESHOLD:
+        return md5s[0].hexdigest() if md5s else hashlib.md5(b'').hexdigest()
+    combined = hashlib.md5(b''.join(m.digest() for m in md5s))
+    return f"{combined.hexdigest()}-{len(md5s)}"
+
+
+def object_key(name, sha256):
+    """Bucket key for an image: its file name plus a short content hash"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}-{sha256[:KEY_HASH_LENGTH]}{ext}"
+
+
+def load_manifest(path=MANIFEST_FILE):
+    return load_json(path, {'public_url': R2_PUBLIC_URL, 'objects': {}})
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    save_json(path, manifest)
+
+
+def scan_images(manifest, images_dir=IMAGES_DIR):
+    """Local images with their hashes, reusing manifest entries for unchanged files"""
+    known = manifest.get('objects', {})
+    local = {}
+    for name in sorted(os.listdir(images_dir)):
+        path = os.path.join(images_dir, name)
+        if not name.lower().endswith(IMAGE_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        entry = known.get(name)
+        if not (entry and entry['size'] == stat.st_size and entry['mtime'] == int(stat.st_mtime)):
+            entry = {
+                'size': stat.st_size,
+                'mtime': int(stat.st_mtime),
+                'sha256': file_hash(path),
+                'etag': expected_etag(path, stat.st_size),
+            }
+        local[name] = dict(entry, path=path, key=object_key(name, entry['sha256']))
+    return local
+
+
+def make_client(endpoint=None):
+    """S3 client for R2 (or any S3-compatible endpoint)"""
+    if not endpoint:
+        account_id = os.environ.get('R2_ACCOUNT_ID')
+        if not account_id:
+            print("❌ Set R2_ACCOUNT_ID or pass --endpoint")
+            sys.exit(1)
+        endpoint = f"https://{account_id}.r2.cloudflarestorage.com"
+    return boto3.client(
+        's3',
+        endpoint_url=endpoint,
+        aws_access_key_id=os.environ.get('R2_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.environ.get('R2_SECRET_ACCESS_KEY'),
+        region_name='auto',
+    )
+
+
+def remote_etags(client, bucket):
+    """Map of object key -> ETag for everything already in the bucket"""
+    etags = {}
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket):
+        for obj in page.get('Contents', []):
+            etags[obj['Key']] = obj['ETag'].strip('"')
+    return etags
+
+
+def upload(client, bucket, key, path):
+    """Upload one file; boto3 switches to multipart above the threshold"""
+    config = TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=CHUNK_SIZE,
+    )
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    client.upload_file(
+        path, bucket, key,
+        ExtraArgs={'ContentType': content_type, 'CacheControl': CACHE_CONTROL},
+        Config=config,
+    )
+    return key
+
+
+def sync(client, bucket, local, remote, workers=UPLOAD_WORKERS, dry_run=False):
+    """Upload images whose key is missing from the bucket or differs; returns names sent"""
+    pending = [name for name, entry in local.items() if remote.get(entry['key']) != entry['etag']]
+    if dry_run or not pending:
+        return pending
+
+    uploaded = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(upload, client, bucket, local[name]['key'], local[name]['path']): name
+            for name in pending
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                uploaded.append(name)
+                print(f"  ✓ Uploaded: {name} ({local[name]['size'] // 1024} KB)")
+            except Exception as e:
+                print(f"  ✗ Failed: {name}: {e}")
+    return uploaded
+
+
+def update_manifest(manifest, local, remote, sent, public_url=None):
+    """Record the objects now in the bucket; returns names that failed to upload"""
+    # Only record objects known to be in the bucket with matching content
+    failed = [name for name, entry in local.items()
+              if remote.get(entry['key']) != entry['etag'] and name not in sent]
+    manifest['public_url'] = public_url or manifest.get('public_url') or R2_PUBLIC_URL
+    manifest['objects'] = {
+        name: {k: v for k, v in entry.items() if k != 'path'}
+        for name, entry in local.items() if name not in failed
+    }
+    return failed
+
+
+def rewrite_pages(objects, public_url, blog_dir=BLOG_DIR):
+    """Point blog pages at the current R2 key of every synced image"""
+    if not objects:
+        return []
+    stems = sorted({os.path.splitext(name)[0] for name in objects}, key=len, reverse=True)
+    # Relative "images/x.jpg" (from blog/), absolute "/blog/images/x.jpg", or
+    # an earlier sync's "<public_url>/x-<hash>.jpg"
+    pattern = re.compile(
+        r'(?<=["\'(])(?:(?:/blog/)?images/|' + re.escape(public_url) + r'/)'
+        r'(' + '|'.join(re.escape(s) for s in stems) + r')'
+        r'(?:-[0-9a-f]{' + str(KEY_HASH_LENGTH) + r'})?(\.\w+)(?=["\')?#])'
+    )
+
+    def _replace(match):
+        entry = objects.get(match.group(1) + match.group(2))
+        return f"{public_url}/{entry['key']}" if entry else match.group(0)
+
+    changed = []
+    for name in sorted(os.listdir(blog_dir)):
+        if not name.endswith('.html'):
+            continue
+        path = os.path.join(blog_dir, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        new_text = pattern.sub(_replace, text)
+        if new_text != text:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_text)
+            changed.append(name)
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync blog images to R2")
+    parser.add_argument("--endpoint", help="S3-compatible endpoint URL (default: R2 for R2_ACCOUNT_ID)")
+    parser.add_argument("--bucket", default=R2_BUCKET)
+    parser.add_argument("--public-url", help="public base URL for synced images (default: the one in the manifest)")
+    parser.add_argument("--workers", type=int, default=UPLOAD_WORKERS)
+    parser.add_argument("--dry-run", action="store_true", help="report what would upload")
+    parser.add_argument("--no-rewrite", action="store_true", help="leave blog HTML untouched")
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    local = scan_images(manifest)
+    print(f"📸 {len(local)} local images in {os.path.relpath(IMAGES_DIR, SITE_ROOT)}/")
+
+    client = make_client(args.endpoint)
+    remote = remote_etags(client, args.bucket)
+    print(f"☁️  {len(remote)} objects in {args.bucket}")
+
+    sent = sync(client, args.bucket, local, remote, args.workers, args.dry_run)
+    if args.dry_run:
+        print(f"\nWould upload {len(sent)} images:")
+        for name in sent:
+            print(f"  • {name}")
+        return
+
+    failed = update_manifest(manifest, local, remote, sent, args.public_url)
+    save_manifest(manifest)
+    print(f"\nUploaded {len(sent)}, unchanged {len(local) - len(sent) - len(failed)}, failed {len(failed)}")
+
+    if not args.no_rewrite:
+        changed = rewrite_pages(manifest['objects'], manifest['public_url'])
+        print(f"Rewrote image URLs in {len(changed)} blog pages")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
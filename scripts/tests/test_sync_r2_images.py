@@ -0,0 +1,149 @@
+"""
+Tests for sync_r2_images against an in-process S3 stand-in (moto)
+
+  python -m pytest scripts/tests
+"""
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("boto3")
+moto = pytest.importorskip("moto")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sync_r2_images as r2  # noqa: E402
+
+BUCKET = "test-blog-images"
+PUBLIC_URL = "https://images.example.com"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with moto.mock_aws():
+        import boto3
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=BUCKET)
+        yield s3
+
+
+@pytest.fixture
+def images(tmp_path):
+    images_dir = tmp_path / "images"
+    images_dir.mkdir()
+    for i in range(3):
+        (images_dir / f"photo-{i}.jpg").write_bytes(os.urandom(1024 + i))
+    (images_dir / "notes.txt").write_text("not an image")
+    return images_dir
+
+
+def run_sync(client, manifest, images_dir, public_url=None):
+    """One sync pass as main() runs it; returns (uploaded names, failed names)"""
+    local = r2.scan_images(manifest, str(images_dir))
+    remote = r2.remote_etags(client, BUCKET)
+    sent = r2.sync(client, BUCKET, local, remote, workers=2)
+    failed = r2.update_manifest(manifest, local, remote, sent, public_url)
+    return sent, failed
+
+
+def test_first_run_uploads_everything(client, images):
+    manifest = {'objects': {}}
+    sent, failed = run_sync(client, manifest, images)
+    assert sorted(sent) == ["photo-0.jpg", "photo-1.jpg", "photo-2.jpg"]
+    assert failed == []
+    keys = sorted(entry['key'] for entry in manifest['objects'].values())
+    assert sorted(r2.remote_etags(client, BUCKET)) == keys
+
+
+def test_keys_carry_content_hash(images):
+    local = r2.scan_images({'objects': {}}, str(images))
+    entry = local["photo-0.jpg"]
+    assert entry['key'] == f"photo-0-{entry['sha256'][:r2.KEY_HASH_LENGTH]}.jpg"
+
+
+def test_second_run_uploads_nothing(client, images):
+    manifest = {'objects': {}}
+    run_sync(client, manifest, images)
+    assert run_sync(client, manifest, images) == ([], [])
+
+
+def test_changed_file_uploads_one_object_under_new_key(client, images):
+    manifest = {'objects': {}}
+    run_sync(client, manifest, images)
+    old_key = manifest['objects']["photo-1.jpg"]['key']
+    (images / "photo-1.jpg").write_bytes(os.urandom(4096))
+    assert run_sync(client, manifest, images) == (["photo-1.jpg"], [])
+    assert manifest['objects']["photo-1.jpg"]['key'] != old_key
+    assert run_sync(client, manifest, images) == ([], [])
+
+
+def test_multipart_etag_matches(client, images):
+    big = images / "panorama.png"
+    big.write_bytes(os.urandom(r2.MULTIPART_THRESHOLD + 1024))
+    local = r2.scan_images({'objects': {}}, str(images))
+    assert local["panorama.png"]['etag'].endswith("-2")
+
+    run_sync(client, {'objects': {}}, images)
+    remote = r2.remote_etags(client, BUCKET)
+    assert remote[local["panorama.png"]['key']] == local["panorama.png"]['etag']
+
+
+def test_failed_upload_left_out_of_manifest(client, images, monkeypatch):
+    real_upload = r2.upload
+
+    def flaky_upload(client, bucket, key, path):
+        if os.path.basename(path) == "photo-2.jpg":
+            raise OSError("connection reset")
+        return real_upload(client, bucket, key, path)
+
+    monkeypatch.setattr(r2, "upload", flaky_upload)
+    manifest = {'objects': {}}
+    sent, failed = run_sync(client, manifest, images)
+    assert sorted(sent) == ["photo-0.jpg", "photo-1.jpg"]
+    assert failed == ["photo-2.jpg"]
+    assert sorted(manifest['objects']) == ["photo-0.jpg", "photo-1.jpg"]
+
+    monkeypatch.setattr(r2, "upload", real_upload)
+    assert run_sync(client, manifest, images) == (["photo-2.jpg"], [])
+
+
+def test_public_url_fallback(client, images):
+    manifest = {'objects': {}}
+    run_sync(client, manifest, images)
+    assert manifest['public_url'] == r2.R2_PUBLIC_URL
+
+    run_sync(client, manifest, images, public_url=PUBLIC_URL)
+    assert manifest['public_url'] == PUBLIC_URL
+
+    # Without --public-url the stored one is kept
+    run_sync(client, manifest, images)
+    assert manifest['public_url'] == PUBLIC_URL
+
+
+def test_rewrite_pages(tmp_path):
+    blog_dir = tmp_path / "blog"
+    blog_dir.mkdir()
+    page = blog_dir / "post.html"
+    page.write_text(
+        '<img src="images/photo-0.jpg">'
+        '<meta property="og:image" content="/blog/images/photo-0.jpg">'
+        '<img src="images/other.jpg">'
+    )
+    (blog_dir / "notes.txt").write_text('"images/photo-0.jpg"')
+
+    objects = {"photo-0.jpg": {'key': "photo-0-aaaaaaaa.jpg"}}
+    assert r2.rewrite_pages(objects, PUBLIC_URL, str(blog_dir)) == ["post.html"]
+    text = page.read_text()
+    assert text.count(f"{PUBLIC_URL}/photo-0-aaaaaaaa.jpg") == 2
+    assert '"images/other.jpg"' in text
+    assert r2.rewrite_pages(objects, PUBLIC_URL, str(blog_dir)) == []
+
+    # A later sync with new content moves pages to the new key
+    objects = {"photo-0.jpg": {'key': "photo-0-bbbbbbbb.jpg"}}
+    assert r2.rewrite_pages(objects, PUBLIC_URL, str(blog_dir)) == ["post.html"]
+    text = page.read_text()
+    assert text.count(f"{PUBLIC_URL}/photo-0-bbbbbbbb.jpg") == 2
+    assert "aaaaaaaa" not in text
@@ -11,6 +11,12 @@ import urllib.error
 from datetime import datetime
 from urllib.parse import urlparse
 import ssl
+import sys
+
+from categories import DEFAULT_CATEGORY
+from image_hints import (
+    MissingImageError, hero_image_html, lazy_load_images, preload_link, save_cache,
+)
 
 # Config
 WP_API = "https://www.truelegacyhomes.com/wp-json/wp/v2"
@@ -49,7 +55,7 @@ def fetch_posts():
     posts = []
     page = 1
     while True:
-        url = f"{WP_API}/posts?categories=5&per_page=100&page={page}&_fields=id,title,slug,date,content,excerpt,featured_media"
+        url = f"{WP_API}/posts?categories=5&per_page=100&page={page}&_fields=id,title,slug,date,date_gmt,content,excerpt,featured_media,categories"
         data = fetch_url(url)
         if not data:
             break
@@ -60,6 +66,30 @@ def fetch_posts():
         page += 1
     return posts
 
+def fetch_category_names():
+    """Map of WordPress category ID -> category name"""
+    names = {}
+    page = 1
+    while True:
+        data = fetch_url(f"{WP_API}/categories?per_page=100&page={page}&_fields=id,name")
+        if not data:
+            break
+        parsed = json.loads(data)
+        if not parsed:
+            break
+        for cat in parsed:
+            names[cat['id']] = html.unescape(cat['name'])
+        page += 1
+    return names
+
+def post_category(post, category_names):
+    """The post's first WordPress category, falling back to Estate Sales"""
+    for cat_id in post.get('categories', []):
+        name = category_names.get(cat_id)
+        if name and name != "Uncategorized":
+            return name
+    return DEFAULT_CATEGORY
+
 def fetch_media_url(media_id):
     """Fetch featured image URL from media ID"""
     if not media_id:
@@ -175,13 +205,14 @@ def escape_json(s):
     """Escape string for JSON"""
     return s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
 
-def generate_blog_html(post, image_path, all_posts):
+def generate_blog_html(post, image_path, all_posts, category):
     """Generate blog post HTML from template"""
     title = html.unescape(post['title']['rendered'])
     slug = post['slug']
     date = format_date(post['date'])
     content = clean_content(post['content']['rendered'])
     excerpt = create_excerpt(content)
+    content = lazy_load_images(content, OUTPUT_DIR)
     
     # Escape for meta tags
     title_escaped = html.escape(title, quote=True)
@@ -193,6 +224,11 @@ def generate_blog_html(post, image_path, all_posts):
     if not image_path:
         image_path = "../images/TOP-495x400.png"
     
+    # Hero markup: dimensions read from the image header, fetched early
+    hero_html = hero_image_html(
+        image_path, title_escaped, "w-full h-64 md:h-96 object-cover rounded-xl shadow-lg", OUTPUT_DIR
+    )
+    
     # Get related posts (3 random others)
     related = [p for p in all_posts if p['slug'] != slug][:3]
     
@@ -226,6 +262,9 @@ def generate_blog_html(post, image_path, all_posts):
   <meta property="og:url" content="https://iambarabbas.github.io/tlh-markdown-demo/blog/{slug}.html">
   
   <link rel="icon" href="../images/favicon.png">
+  <link rel="alternate" type="application/feed+json" title="True Legacy Homes Blog" href="/blog/feed.json">
+  <link rel="alternate" type="application/rss+xml" title="True Legacy Homes Blog" href="/blog/feed.xml">
+  {preload_link(image_path)}
   
   <!-- Schema.org Article Markup -->
   <script type="application/ld+json">
@@ -313,7 +352,7 @@ def generate_blog_html(post, image_path, all_posts):
     <div class="max-w-4xl mx-auto px-4">
       <a href="../blog.html" class="text-tlh-teal font-semibold hover:underline mb-4 inline-block">← Back to Blog</a>
       <div class="flex items-center gap-3 mb-4">
-        <span class="text-sm bg-tlh-teal text-white px-3 py-1 rounded-full">Estate Sales</span>
+        <span class="text-sm bg-tlh-teal text-white px-3 py-1 rounded-full">{html.escape(category)}</span>
         <span class="text-gray-500 text-sm">{date}</span>
       </div>
       <h1 class="text-3xl md:text-4xl lg:text-5xl font-bold text-tlh-dark leading-tight">
@@ -331,7 +370,7 @@ def generate_blog_html(post, image_path, all_posts):
 
   <!-- Featured Image -->
   <div class="max-w-4xl mx-auto px-4 -mt-4">
-    <img src="{image_path}" alt="{title_escaped}" class="w-full h-64 md:h-96 object-cover rounded-xl shadow-lg">
+    {hero_html}
   </div>
 
   <!-- Article Content -->
@@ -431,6 +470,7 @@ def main():
     print("Fetching posts from WordPress...")
     posts = fetch_posts()
     print(f"Found {len(posts)} posts in Estate Sales category")
+    category_names = fetch_category_names()
     
     successful = []
     failed = []
@@ -448,21 +488,35 @@ def main():
                 if media_url:
                     image_path = download_image(media_url, slug)
             
-            # Generate HTML
-            html_content = generate_blog_html(post, image_path, posts)
+            # Use the post's WordPress category and generate HTML
+            category = post_category(post, category_names)
+            html_content = generate_blog_html(post, image_path, posts, category)
             
             # Write file
             filepath = f"{OUTPUT_DIR}/{slug}.html"
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(html_content)
             
-            successful.append({'slug': slug, 'title': title, 'date': post['date']})
+            successful.append({
+                'slug': slug,
+                'title': title,
+                'date': post['date'],
+                'date_gmt': post.get('date_gmt'),
+                'category': category,
+                'excerpt': create_excerpt(clean_content(post['content']['rendered'])),
+                'image': image_path
+            })
             print(f"  ✓ Created: {slug}.html")
             
+        except MissingImageError as e:
+            failed.append({'slug': slug, 'error': str(e)})
+            print(f"  ✗ Missing image: {e}")
         except Exception as e:
             failed.append({'slug': slug, 'error': str(e)})
             print(f"  ✗ Failed: {e}")
     
+    save_cache()
+    
     # Summary
     print("\n" + "="*50)
     print(f"TRANSFER COMPLETE")
@@ -492,6 +546,9 @@ def main():
         print(f"  - blog/{s['slug']}.html")
     if len(successful) > 5:
         print(f"  ... and {len(successful) - 5} more")
+    
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()